@@ -191,10 +191,12 @@ API
 
 from __future__ import annotations
 
+import types
 import typing
 import urllib
 from functools import wraps
-from timeit import default_timer
+from re import Pattern
+from time import perf_counter_ns
 from typing import Any, Awaitable, Callable, Tuple
 
 from asgiref.compatibility import guarantee_single_callable
@@ -219,6 +221,7 @@ from opentelemetry.util.http import (
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SERVER_REQUEST,
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SERVER_RESPONSE,
     SanitizeValue,
+    _compile_header_regexes,
     _parse_active_request_count_attrs,
     _parse_duration_attrs,
     get_custom_headers,
@@ -227,10 +230,89 @@ from opentelemetry.util.http import (
     remove_url_credentials,
 )
 
+# Span attribute names resolved once, as they are used for every request
+_HTTP_SCHEME = SpanAttributes.HTTP_SCHEME
+_HTTP_HOST = SpanAttributes.HTTP_HOST
+_NET_HOST_PORT = SpanAttributes.NET_HOST_PORT
+_HTTP_FLAVOR = SpanAttributes.HTTP_FLAVOR
+_HTTP_TARGET = SpanAttributes.HTTP_TARGET
+_HTTP_URL = SpanAttributes.HTTP_URL
+_HTTP_METHOD = SpanAttributes.HTTP_METHOD
+_HTTP_SERVER_NAME = SpanAttributes.HTTP_SERVER_NAME
+_HTTP_USER_AGENT = SpanAttributes.HTTP_USER_AGENT
+_NET_PEER_IP = SpanAttributes.NET_PEER_IP
+_NET_PEER_PORT = SpanAttributes.NET_PEER_PORT
+_HTTP_STATUS_CODE = SpanAttributes.HTTP_STATUS_CODE
+
+# Span attributes copied as is from the ASGI scope, when present
+_SCOPE_ATTRIBUTES = (
+    (_HTTP_SCHEME, "scheme"),
+    (_HTTP_FLAVOR, "http_version"),
+    (_HTTP_TARGET, "path"),
+)
+
 _ServerRequestHookT = typing.Optional[typing.Callable[[Span, dict], None]]
 _ClientRequestHookT = typing.Optional[typing.Callable[[Span, dict], None]]
 _ClientResponseHookT = typing.Optional[typing.Callable[[Span, dict], None]]
 
+# Shared result for collect_custom_headers_attributes when nothing is captured
+_EMPTY_HEADERS = types.MappingProxyType({})
+
+
+# Key under which ASGIGetter caches the decoded headers of a carrier
+_HEADERS_INDEX_KEY = "_otel_headers_index"
+
+
+def _get_headers_snapshot(
+    headers: typing.Iterable[typing.Tuple[bytes, bytes]]
+) -> typing.Tuple[typing.Tuple[bytes, bytes], ...]:
+    """Returns an immutable copy of the header pairs, used to tell whether
+    a cached headers index is still up to date."""
+    return tuple(map(tuple, headers))
+
+
+def _get_cached_headers_index(
+    carrier: dict, snapshot: typing.Tuple[typing.Tuple[bytes, bytes], ...]
+) -> typing.Optional[typing.Dict[bytes, typing.Tuple[str, ...]]]:
+    """Returns the index built by _get_headers_index for the carrier headers,
+    or None if there is none or the headers changed since it was built.
+
+    ``snapshot`` is the result of _get_headers_snapshot for the current
+    carrier headers.
+    """
+    cached = carrier.get(_HEADERS_INDEX_KEY)
+    # Unchanged header pairs hold the very same bytes objects, so comparing
+    # the snapshots is a cheap identity check per header.
+    if cached is not None and cached[0] == snapshot:
+        return cached[1]
+    return None
+
+
+def _get_headers_index(
+    carrier: dict, headers: typing.Iterable[typing.Tuple[bytes, bytes]]
+) -> typing.Dict[bytes, typing.Tuple[str, ...]]:
+    """Returns the carrier headers grouped by lowercase header name, decoding
+    every header value only once per carrier.
+
+    The index is cached on the carrier and rebuilt whenever its headers are
+    replaced or modified (e.g. by ASGISetter).
+    """
+    snapshot = _get_headers_snapshot(headers)
+    index = _get_cached_headers_index(carrier, snapshot)
+    if index is not None:
+        return index
+
+    # Values are kept as tuples so that callers cannot change the cache
+    index = {}
+    for _key, _value in snapshot:
+        _key = _key.lower()
+        if _key in index:
+            index[_key] += (_value.decode("utf8"),)
+        else:
+            index[_key] = (_value.decode("utf8"),)
+    carrier[_HEADERS_INDEX_KEY] = (snapshot, index)
+    return index
+
 
 class ASGIGetter(Getter[dict]):
     def get(
@@ -251,15 +333,8 @@ class ASGIGetter(Getter[dict]):
             return None
 
         # ASGI header keys are in lower case
-        key = key.lower()
-        decoded = [
-            _value.decode("utf8")
-            for (_key, _value) in headers
-            if _key.decode("utf8").lower() == key
-        ]
-        if not decoded:
-            return None
-        return decoded
+        values = _get_headers_index(carrier, headers).get(key.lower().encode())
+        return list(values) if values is not None else None
 
     def keys(self, carrier: dict) -> typing.List[str]:
         headers = carrier.get("headers") or []
@@ -293,43 +368,51 @@ class ASGISetter(Setter[dict]):
 asgi_setter = ASGISetter()
 
 
-def collect_request_attributes(scope):
+def collect_request_attributes(scope, host_port_url=None):
     """Collects HTTP request attributes from the ASGI scope and returns a
-    dictionary to be used as span creation attributes."""
-    server_host, port, http_url = get_host_port_url_tuple(scope)
+    dictionary to be used as span creation attributes.
+
+    ``host_port_url`` may be passed if the result of
+    ``get_host_port_url_tuple`` for the scope is already known."""
+    server_host, port, http_url = host_port_url or get_host_port_url_tuple(
+        scope
+    )
     query_string = scope.get("query_string")
     if query_string and http_url:
         if isinstance(query_string, bytes):
             query_string = query_string.decode("utf8")
         http_url += "?" + urllib.parse.unquote(query_string)
 
+    # only add attributes which are present, instead of filtering out None
+    # values afterwards
     result = {
-        SpanAttributes.HTTP_SCHEME: scope.get("scheme"),
-        SpanAttributes.HTTP_HOST: server_host,
-        SpanAttributes.NET_HOST_PORT: port,
-        SpanAttributes.HTTP_FLAVOR: scope.get("http_version"),
-        SpanAttributes.HTTP_TARGET: scope.get("path"),
-        SpanAttributes.HTTP_URL: remove_url_credentials(http_url),
+        _HTTP_HOST: server_host,
+        _HTTP_URL: remove_url_credentials(http_url),
     }
+    if port is not None:
+        result[_NET_HOST_PORT] = port
+    for attribute, scope_key in _SCOPE_ATTRIBUTES:
+        value = scope.get(scope_key)
+        if value is not None:
+            result[attribute] = value
+
     http_method = scope.get("method")
     if http_method:
-        result[SpanAttributes.HTTP_METHOD] = http_method
+        result[_HTTP_METHOD] = http_method
 
     http_host_value_list = asgi_getter.get(scope, "host")
     if http_host_value_list:
-        result[SpanAttributes.HTTP_SERVER_NAME] = ",".join(
-            http_host_value_list
-        )
+        result[_HTTP_SERVER_NAME] = ",".join(http_host_value_list)
     http_user_agent = asgi_getter.get(scope, "user-agent")
     if http_user_agent:
-        result[SpanAttributes.HTTP_USER_AGENT] = http_user_agent[0]
-
-    if "client" in scope and scope["client"] is not None:
-        result[SpanAttributes.NET_PEER_IP] = scope.get("client")[0]
-        result[SpanAttributes.NET_PEER_PORT] = scope.get("client")[1]
+        result[_HTTP_USER_AGENT] = http_user_agent[0]
 
-    # remove None values
-    result = {k: v for k, v in result.items() if v is not None}
+    client = scope.get("client")
+    if client is not None:
+        if client[0] is not None:
+            result[_NET_PEER_IP] = client[0]
+        if client[1] is not None:
+            result[_NET_PEER_PORT] = client[1]
 
     return result
 
@@ -337,26 +420,48 @@ def collect_request_attributes(scope):
 def collect_custom_headers_attributes(
     scope_or_response_message: dict[str, Any],
     sanitize: SanitizeValue,
-    header_regexes: list[str],
+    header_regexes: list[str] | Pattern[str] | None,
     normalize_names: Callable[[str], str],
-) -> dict[str, str]:
+) -> typing.Mapping[str, typing.List[str]]:
     """
     Returns custom HTTP request or response headers to be added into SERVER span as span attributes.
 
+    ``header_regexes`` may be given already compiled (see
+    ``OpenTelemetryMiddleware``) to avoid rebuilding the pattern per request.
+
     Refer specifications:
      - https://github.com/open-telemetry/opentelemetry-specification/blob/main/specification/trace/semantic_conventions/http.md#http-request-and-response-headers
     """
-    # Decode headers before processing.
-    headers: dict[str, str] = {}
-    raw_headers = scope_or_response_message.get("headers")
-    if raw_headers:
+    if not header_regexes:
+        return _EMPTY_HEADERS
+
+    raw_headers = scope_or_response_message.get("headers") or ()
+    # Reuse the headers already decoded by asgi_getter lookups, which is
+    # usually the case for the request scope.
+    index = None
+    if _HEADERS_INDEX_KEY in scope_or_response_message:
+        raw_headers = _get_headers_snapshot(raw_headers)
+        index = _get_cached_headers_index(
+            scope_or_response_message, raw_headers
+        )
+    if index is not None:
+        headers = {
+            _key.decode(): ",".join(_values) for _key, _values in index.items()
+        }
+    else:
+        # Merge repeated headers by their raw name, so that every distinct
+        # header name is only decoded once.
+        merged_headers: dict[bytes, bytes] = {}
         for _key, _value in raw_headers:
-            key = _key.decode().lower()
-            value = _value.decode()
-            if key in headers:
-                headers[key] += f",{value}"
+            _key = _key.lower()
+            if _key in merged_headers:
+                merged_headers[_key] += b"," + _value
             else:
-                headers[key] = value
+                merged_headers[_key] = _value
+        headers = {
+            _key.decode(): _value.decode()
+            for _key, _value in merged_headers.items()
+        }
 
     return sanitize.sanitize_header_values(
         headers,
@@ -369,7 +474,7 @@ def get_host_port_url_tuple(scope):
     """Returns (host, port, full_url) tuple."""
     server = scope.get("server") or ["0.0.0.0", 80]
     port = server[1]
-    server_host = server[0] + (":" + str(port) if str(port) != "80" else "")
+    server_host = server[0] + (":" + str(port) if port != 80 else "")
     full_path = scope.get("root_path", "") + scope.get("path", "")
     http_url = scope.get("scheme", "http") + "://" + server_host + full_path
     return server_host, port, http_url
@@ -389,12 +494,19 @@ def set_status_code(span, status_code):
             )
         )
     else:
-        span.set_attribute(SpanAttributes.HTTP_STATUS_CODE, status_code)
+        span.set_attribute(_HTTP_STATUS_CODE, status_code)
         span.set_status(
             Status(http_status_to_status_code(status_code, server_span=True))
         )
 
 
+def _end_span(span, token):
+    if token:
+        context.detach(token)
+    if span.is_recording():
+        span.end()
+
+
 def get_default_span_details(scope: dict) -> Tuple[str, dict]:
     """
     Default span name is the HTTP method and URL path, or just the method.
@@ -519,9 +631,17 @@ class OpenTelemetryMiddleware:
         self.default_span_details = (
             default_span_details or get_default_span_details
         )
-        self.server_request_hook = server_request_hook
-        self.client_request_hook = client_request_hook
-        self.client_response_hook = client_response_hook
+        # Hooks are validated once here, so that they only need to be
+        # compared against None for every request and message.
+        self.server_request_hook = (
+            server_request_hook if callable(server_request_hook) else None
+        )
+        self.client_request_hook = (
+            client_request_hook if callable(client_request_hook) else None
+        )
+        self.client_response_hook = (
+            client_response_hook if callable(client_response_hook) else None
+        )
         self.content_length_header = None
 
         # Environment variables as constructor parameters
@@ -552,6 +672,16 @@ class OpenTelemetryMiddleware:
             )
             or []
         )
+        self._scope_type_handlers = {
+            "http": self._call_http,
+            "websocket": self._call_websocket,
+        }
+        self._http_capture_headers_server_request_regex = (
+            _compile_header_regexes(self.http_capture_headers_server_request)
+        )
+        self._http_capture_headers_server_response_regex = (
+            _compile_header_regexes(self.http_capture_headers_server_response)
+        )
 
     async def __call__(
         self,
@@ -566,108 +696,175 @@ class OpenTelemetryMiddleware:
             receive: An awaitable callable yielding dictionaries
             send: An awaitable callable taking a single dictionary as argument.
         """
-        start = default_timer()
-        if scope["type"] not in ("http", "websocket"):
+        handler = self._scope_type_handlers.get(scope["type"])
+        if handler is None:
             return await self.app(scope, receive, send)
+        return await handler(scope, receive, send)
 
-        _, _, url = get_host_port_url_tuple(scope)
-        if self.excluded_urls and self.excluded_urls.url_disabled(url):
+    async def _call_http(self, scope, receive, send):
+        start = perf_counter_ns()
+        started = self._start_span(scope)
+        if started is None:
             return await self.app(scope, receive, send)
 
-        span_name, additional_attributes = self.default_span_details(scope)
-
-        attributes = collect_request_attributes(scope)
-        attributes.update(additional_attributes)
-        span, token = _start_internal_or_server_span(
-            tracer=self.tracer,
-            span_name=span_name,
-            start_time=None,
-            context_carrier=scope,
-            context_getter=asgi_getter,
-            attributes=attributes,
-        )
+        span, token, span_name, attributes = started
         active_requests_count_attrs = _parse_active_request_count_attrs(
             attributes
         )
         duration_attrs = _parse_duration_attrs(attributes)
 
-        if scope["type"] == "http":
-            self.active_requests_counter.add(1, active_requests_count_attrs)
+        self.active_requests_counter.add(1, active_requests_count_attrs)
         try:
             with trace.use_span(span, end_on_exit=False) as current_span:
-                if current_span.is_recording():
-                    for key, value in attributes.items():
-                        current_span.set_attribute(key, value)
-
-                    if current_span.kind == trace.SpanKind.SERVER:
-                        custom_attributes = (
-                            collect_custom_headers_attributes(
-                                scope,
-                                self.http_capture_headers_sanitize_fields,
-                                self.http_capture_headers_server_request,
-                                normalise_request_header_name,
-                            )
-                            if self.http_capture_headers_server_request
-                            else {}
-                        )
-                        if len(custom_attributes) > 0:
-                            current_span.set_attributes(custom_attributes)
-
-                if callable(self.server_request_hook):
-                    self.server_request_hook(current_span, scope)
-
-                otel_receive = self._get_otel_receive(
-                    span_name, scope, receive
-                )
-
-                otel_send = self._get_otel_send(
+                otel_receive, otel_send = self._setup_request(
                     current_span,
                     span_name,
+                    attributes,
                     scope,
+                    receive,
                     send,
                     duration_attrs,
                 )
-
                 await self.app(scope, otel_receive, otel_send)
         finally:
-            if scope["type"] == "http":
-                target = _collect_target_attribute(scope)
-                if target:
-                    duration_attrs[SpanAttributes.HTTP_TARGET] = target
-                duration = max(round((default_timer() - start) * 1000), 0)
-                self.duration_histogram.record(duration, duration_attrs)
-                self.active_requests_counter.add(
-                    -1, active_requests_count_attrs
+            target = _collect_target_attribute(scope)
+            if target:
+                duration_attrs[_HTTP_TARGET] = target
+            # elapsed nanoseconds rounded to milliseconds
+            duration = max(
+                (perf_counter_ns() - start + 500_000) // 1_000_000, 0
+            )
+            self.duration_histogram.record(duration, duration_attrs)
+            self.active_requests_counter.add(-1, active_requests_count_attrs)
+            if self.content_length_header:
+                self.server_response_size_histogram.record(
+                    self.content_length_header, duration_attrs
                 )
-                if self.content_length_header:
-                    self.server_response_size_histogram.record(
-                        self.content_length_header, duration_attrs
+            request_size = asgi_getter.get(scope, "content-length")
+            if request_size:
+                try:
+                    request_size_amount = int(request_size[0])
+                except ValueError:
+                    pass
+                else:
+                    self.server_request_size_histogram.record(
+                        request_size_amount, duration_attrs
                     )
-                request_size = asgi_getter.get(scope, "content-length")
-                if request_size:
-                    try:
-                        request_size_amount = int(request_size[0])
-                    except ValueError:
-                        pass
-                    else:
-                        self.server_request_size_histogram.record(
-                            request_size_amount, duration_attrs
-                        )
-            if token:
-                context.detach(token)
-            if span.is_recording():
-                span.end()
+            _end_span(span, token)
+
+    async def _call_websocket(self, scope, receive, send):
+        started = self._start_span(scope)
+        if started is None:
+            return await self.app(scope, receive, send)
+
+        span, token, span_name, attributes = started
+        try:
+            with trace.use_span(span, end_on_exit=False) as current_span:
+                otel_receive, otel_send = self._setup_request(
+                    current_span,
+                    span_name,
+                    attributes,
+                    scope,
+                    receive,
+                    send,
+                    {},
+                )
+                await self.app(scope, otel_receive, otel_send)
+        finally:
+            _end_span(span, token)
+
+    def _start_span(self, scope):
+        """Starts the span for a http or websocket scope.
+
+        Returns the span, the context token to detach, the span name and the
+        span attributes, or None if the URL is excluded from tracing.
+        """
+        host_port_url = get_host_port_url_tuple(scope)
+        if self.excluded_urls and self.excluded_urls.url_disabled(
+            host_port_url[2]
+        ):
+            return None
+
+        span_name, additional_attributes = self.default_span_details(scope)
+
+        attributes = collect_request_attributes(scope, host_port_url)
+        attributes.update(additional_attributes)
+        span, token = _start_internal_or_server_span(
+            tracer=self.tracer,
+            span_name=span_name,
+            start_time=None,
+            context_carrier=scope,
+            context_getter=asgi_getter,
+            attributes=attributes,
+        )
+        return span, token, span_name, attributes
+
+    def _setup_request(
+        self,
+        current_span,
+        span_name,
+        attributes,
+        scope,
+        receive,
+        send,
+        duration_attrs,
+    ):
+        """Annotates the active span and returns the receive and send
+        callables to pass to the wrapped application."""
+        if current_span.is_recording():
+            # The attributes given to start_span only reach the span if the
+            # sampler returns them, so they are set again in a single call.
+            current_span.set_attributes(attributes)
+
+            if (
+                current_span.kind == trace.SpanKind.SERVER
+                and self._http_capture_headers_server_request_regex
+            ):
+                custom_attributes = collect_custom_headers_attributes(
+                    scope,
+                    self.http_capture_headers_sanitize_fields,
+                    self._http_capture_headers_server_request_regex,
+                    normalise_request_header_name,
+                )
+                if len(custom_attributes) > 0:
+                    current_span.set_attributes(custom_attributes)
+
+        if self.server_request_hook is not None:
+            self.server_request_hook(current_span, scope)
+
+        otel_receive = self._get_otel_receive(
+            current_span, span_name, scope, receive
+        )
+
+        otel_send = self._get_otel_send(
+            current_span,
+            span_name,
+            scope,
+            send,
+            duration_attrs,
+        )
+        return otel_receive, otel_send
 
     # pylint: enable=too-many-branches
 
-    def _get_otel_receive(self, server_span_name, scope, receive):
+    def _get_otel_receive(self, server_span, server_span_name, scope, receive):
+        client_request_hook = self.client_request_hook
+        # A receive span started under a non recording server span would not
+        # record anything either, so only create it if a hook may use it.
+        if not (server_span.is_recording() or client_request_hook is not None):
+            return receive
+
+        receive_span_name = " ".join(
+            (server_span_name, scope["type"], "receive")
+        )
+
         @wraps(receive)
         async def otel_receive():
             with self.tracer.start_as_current_span(
-                " ".join((server_span_name, scope["type"], "receive"))
+                receive_span_name
             ) as receive_span:
-                if callable(self.client_request_hook):
-                    self.client_request_hook(receive_span, scope)
+                if client_request_hook is not None:
+                    client_request_hook(receive_span, scope)
                 message = await receive()
                 if receive_span.is_recording():
                     if message["type"] == "websocket.receive":
@@ -682,26 +879,53 @@ class OpenTelemetryMiddleware:
     def _get_otel_send(
         self, server_span, server_span_name, scope, send, duration_attrs
     ):
-        expecting_trailers = False
+        # See _get_otel_receive, a send span is also needed to inject the
+        # response propagation headers. A non recording server span does not
+        # need to be ended either.
+        client_response_hook = self.client_response_hook
+        propagator = get_global_response_propagator()
+        propagation_context = (
+            set_span_in_context(server_span, trace.context_api.Context())
+            if propagator
+            else None
+        )
+        if not (
+            server_span.is_recording()
+            or propagator is not None
+            or client_response_hook is not None
+        ):
+            # only the response size is still needed, for the metrics
+            @wraps(send)
+            async def otel_send_untraced(message: dict[str, Any]):
+                self._set_content_length_header(message)
+                await send(message)
+
+            return otel_send_untraced
+
+        # The message type and "more" flag that terminate the response,
+        # switched to the trailers pair once the response start announces
+        # trailers.
+        end_message_type, end_more_key = "http.response.body", "more_body"
+        send_span_name = " ".join((server_span_name, scope["type"], "send"))
 
         @wraps(send)
         async def otel_send(message: dict[str, Any]):
-            nonlocal expecting_trailers
+            nonlocal end_message_type, end_more_key
             with self.tracer.start_as_current_span(
-                " ".join((server_span_name, scope["type"], "send"))
+                send_span_name
             ) as send_span:
-                if callable(self.client_response_hook):
-                    self.client_response_hook(send_span, message)
+                if client_response_hook is not None:
+                    client_response_hook(send_span, message)
                 if send_span.is_recording():
                     if message["type"] == "http.response.start":
                         status_code = message["status"]
-                        duration_attrs[
-                            SpanAttributes.HTTP_STATUS_CODE
-                        ] = status_code
+                        duration_attrs[_HTTP_STATUS_CODE] = status_code
                         set_status_code(server_span, status_code)
                         set_status_code(send_span, status_code)
 
-                        expecting_trailers = message.get("trailers", False)
+                        if message.get("trailers", False):
+                            end_message_type = "http.response.trailers"
+                            end_more_key = "more_trailers"
                     elif message["type"] == "websocket.send":
                         set_status_code(server_span, 200)
                         set_status_code(send_span, 200)
@@ -710,50 +934,43 @@ class OpenTelemetryMiddleware:
                         server_span.is_recording()
                         and server_span.kind == trace.SpanKind.SERVER
                         and "headers" in message
+                        and self._http_capture_headers_server_response_regex
                     ):
-                        custom_response_attributes = (
-                            collect_custom_headers_attributes(
-                                message,
-                                self.http_capture_headers_sanitize_fields,
-                                self.http_capture_headers_server_response,
-                                normalise_response_header_name,
-                            )
-                            if self.http_capture_headers_server_response
-                            else {}
+                        custom_response_attributes = collect_custom_headers_attributes(
+                            message,
+                            self.http_capture_headers_sanitize_fields,
+                            self._http_capture_headers_server_response_regex,
+                            normalise_response_header_name,
                         )
                         if len(custom_response_attributes) > 0:
                             server_span.set_attributes(
                                 custom_response_attributes
                             )
 
-                propagator = get_global_response_propagator()
                 if propagator:
                     propagator.inject(
                         message,
-                        context=set_span_in_context(
-                            server_span, trace.context_api.Context()
-                        ),
+                        context=propagation_context,
                         setter=asgi_setter,
                     )
 
-                content_length = asgi_getter.get(message, "content-length")
-                if content_length:
-                    try:
-                        self.content_length_header = int(content_length[0])
-                    except ValueError:
-                        pass
+                self._set_content_length_header(message)
 
                 await send(message)
-            # pylint: disable=too-many-boolean-expressions
-            if (
-                not expecting_trailers
-                and message["type"] == "http.response.body"
-                and not message.get("more_body", False)
-            ) or (
-                expecting_trailers
-                and message["type"] == "http.response.trailers"
-                and not message.get("more_trailers", False)
+            if message["type"] == end_message_type and not message.get(
+                end_more_key, False
             ):
                 server_span.end()
 
         return otel_send
+
+    def _set_content_length_header(self, message: dict[str, Any]) -> None:
+        # Scan the raw headers directly rather than going through asgi_getter,
+        # which would decode every header and cache them on the message.
+        for _key, _value in message.get("headers") or ():
+            if _key.lower() == b"content-length":
+                try:
+                    self.content_length_header = int(_value)
+                except ValueError:
+                    pass
+                break
@@ -33,6 +33,7 @@ from opentelemetry.sdk.metrics.export import (
     HistogramDataPoint,
     NumberDataPoint,
 )
+from opentelemetry.sdk.trace.sampling import Decision, Sampler, SamplingResult
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.test.asgitestutil import (
     AsgiTestBase,
@@ -335,6 +336,34 @@ class TestAsgiApplication(AsgiTestBase):
             self.assertFalse(mock_span.set_attribute.called)
             self.assertFalse(mock_span.set_status.called)
 
+    def test_asgi_not_recording_skips_send_receive_spans(self):
+        mock_tracer = mock.Mock()
+        mock_span = mock.Mock()
+        mock_span.is_recording.return_value = False
+        mock_tracer.start_span.return_value = mock_span
+        with mock.patch("opentelemetry.trace.get_tracer") as tracer:
+            tracer.return_value = mock_tracer
+            app = otel_asgi.OpenTelemetryMiddleware(simple_asgi)
+            self.seed_app(app)
+            self.send_default_request()
+            response_start, response_body, *_ = self.get_all_output()
+            self.assertEqual(response_start["status"], 200)
+            self.assertEqual(response_body["body"], b"*")
+            self.assertTrue(mock_tracer.start_span.called)
+            self.assertFalse(mock_tracer.start_as_current_span.called)
+
+    def test_asgi_not_recording_passes_receive_through(self):
+        async def receive():
+            return {"type": "http.request"}
+
+        app = otel_asgi.OpenTelemetryMiddleware(simple_asgi)
+        self.assertIs(
+            app._get_otel_receive(
+                trace_api.INVALID_SPAN, "GET /", self.scope, receive
+            ),
+            receive,
+        )
+
     def test_asgi_exc_info(self):
         """Test that exception information is emitted as expected."""
         app = otel_asgi.OpenTelemetryMiddleware(error_asgi)
@@ -472,6 +501,39 @@ class TestAsgiApplication(AsgiTestBase):
         span_list = self.memory_exporter.get_finished_spans()
         self.assertEqual(len(span_list), 0)
 
+    def test_sampler_not_returning_attributes_otel_asgi(self):
+        class RecordingSampler(Sampler):
+            def should_sample(self, *args, **kwargs):
+                return SamplingResult(Decision.RECORD_AND_SAMPLE)
+
+            def get_description(self):
+                return "RecordingSampler"
+
+        tracer_provider, exporter = TestBase.create_tracer_provider(
+            sampler=RecordingSampler()
+        )
+        app = otel_asgi.OpenTelemetryMiddleware(
+            simple_asgi, tracer_provider=tracer_provider
+        )
+        self.seed_app(app)
+        self.send_default_request()
+
+        server_span = [
+            span
+            for span in exporter.get_finished_spans()
+            if span.kind == SpanKind.SERVER
+        ][0]
+        self.assertEqual(
+            server_span.attributes[SpanAttributes.HTTP_METHOD], "GET"
+        )
+        self.assertEqual(
+            server_span.attributes[SpanAttributes.HTTP_URL],
+            "http://127.0.0.1/",
+        )
+        self.assertEqual(
+            server_span.attributes[SpanAttributes.NET_PEER_IP], "127.0.0.1"
+        )
+
     def test_behavior_with_scope_server_as_none(self):
         """Test that middleware is ok when server is none in scope."""
 
@@ -712,6 +774,21 @@ class TestAsgiApplication(AsgiTestBase):
             outputs, modifiers=[update_expected_hook_results]
         )
 
+    def test_non_callable_hooks_ignored(self):
+        app = otel_asgi.OpenTelemetryMiddleware(
+            simple_asgi,
+            server_request_hook="not callable",
+            client_request_hook="not callable",
+            client_response_hook="not callable",
+        )
+        self.assertIsNone(app.server_request_hook)
+        self.assertIsNone(app.client_request_hook)
+        self.assertIsNone(app.client_response_hook)
+        self.seed_app(app)
+        self.send_default_request()
+        outputs = self.get_all_output()
+        self.validate_outputs(outputs)
+
     def test_asgi_metrics(self):
         app = otel_asgi.OpenTelemetryMiddleware(simple_asgi)
         self.seed_app(app)
@@ -874,6 +951,17 @@ class TestAsgiAttributes(unittest.TestCase):
             },
         )
 
+    def test_request_attributes_precomputed_host_port_url(self):
+        self.scope["server"] = ("127.0.0.1", 8080)
+        host_port_url = otel_asgi.get_host_port_url_tuple(self.scope)
+        self.assertEqual(
+            host_port_url, ("127.0.0.1:8080", 8080, "http://127.0.0.1:8080/")
+        )
+        self.assertEqual(
+            otel_asgi.collect_request_attributes(self.scope, host_port_url),
+            otel_asgi.collect_request_attributes(self.scope),
+        )
+
     def test_query_string(self):
         self.scope["query_string"] = b"foo=bar"
         attrs = otel_asgi.collect_request_attributes(self.scope)
@@ -914,6 +1002,46 @@ class TestAsgiAttributes(unittest.TestCase):
             attrs[SpanAttributes.HTTP_URL], "http://mock/status/200"
         )
 
+    def test_collect_custom_headers_attributes_not_configured(self):
+        self.scope["headers"] = [(b"custom-test-header", b"test-value")]
+        sanitize = otel_asgi.SanitizeValue([])
+        for header_regexes in (None, []):
+            self.assertEqual(
+                otel_asgi.collect_custom_headers_attributes(
+                    self.scope,
+                    sanitize,
+                    header_regexes,
+                    otel_asgi.normalise_request_header_name,
+                ),
+                {},
+            )
+
+    def test_collect_custom_headers_attributes_cached_headers(self):
+        self.scope["headers"] = [
+            (b"custom-test-header", b"test-value-1"),
+            (b"Custom-Test-Header", b"test-value-2"),
+            (b"other-header", b"other-value"),
+        ]
+        sanitize = otel_asgi.SanitizeValue([])
+        expected = {
+            "http.request.header.custom_test_header": [
+                "test-value-1,test-value-2"
+            ],
+        }
+
+        def collect():
+            return otel_asgi.collect_custom_headers_attributes(
+                self.scope,
+                sanitize,
+                ["custom-test-header"],
+                otel_asgi.normalise_request_header_name,
+            )
+
+        self.assertEqual(collect(), expected)
+        # populates the cached headers index on the scope
+        otel_asgi.asgi_getter.get(self.scope, "other-header")
+        self.assertEqual(collect(), expected)
+
     def test_collect_target_attribute_missing(self):
         self.assertIsNone(otel_asgi._collect_target_attribute(self.scope))
 
@@ -50,6 +50,62 @@ class TestASGIGetter(TestCase):
             "Should be case insensitive",
         )
 
+    def test_get_repeated_headers(self):
+        getter = ASGIGetter()
+        carrier = {
+            "headers": [
+                (b"test-key", b"val1"),
+                (b"other-key", b"other"),
+                (b"test-key", b"val2"),
+            ]
+        }
+        self.assertEqual(getter.get(carrier, "test-key"), ["val1", "val2"])
+        self.assertEqual(getter.get(carrier, "other-key"), ["other"])
+        self.assertIsNone(getter.get(carrier, "missing-key"))
+
+    def test_get_updated_headers(self):
+        getter = ASGIGetter()
+        carrier = {"headers": [(b"test-key", b"val")]}
+        self.assertIsNone(getter.get(carrier, "new-key"))
+
+        carrier["headers"].append((b"new-key", b"new-val"))
+        self.assertEqual(getter.get(carrier, "new-key"), ["new-val"])
+
+        carrier["headers"] = [(b"test-key", b"replaced")]
+        self.assertEqual(getter.get(carrier, "test-key"), ["replaced"])
+        self.assertIsNone(getter.get(carrier, "new-key"))
+
+    def test_get_headers_modified_in_place(self):
+        getter = ASGIGetter()
+        carrier = {"headers": [(b"host", b"a"), [b"user-agent", b"ua"]]}
+        self.assertEqual(getter.get(carrier, "host"), ["a"])
+        self.assertEqual(getter.get(carrier, "user-agent"), ["ua"])
+
+        carrier["headers"][0] = (b"host", b"b")
+        self.assertEqual(getter.get(carrier, "host"), ["b"])
+
+        carrier["headers"][1][1] = b"other"
+        self.assertEqual(getter.get(carrier, "user-agent"), ["other"])
+
+    def test_get_result_does_not_change_cache(self):
+        getter = ASGIGetter()
+        carrier = {"headers": [(b"test-key", b"val")]}
+        getter.get(carrier, "test-key").append("x")
+        self.assertEqual(getter.get(carrier, "test-key"), ["val"])
+
+    def test_get_headers_without_len(self):
+        class Headers:
+            def __init__(self, headers):
+                self._headers = headers
+
+            def __iter__(self):
+                return iter(self._headers)
+
+        getter = ASGIGetter()
+        carrier = {"headers": Headers([(b"test-key", b"val")])}
+        self.assertEqual(getter.get(carrier, "test-key"), ["val"])
+        self.assertIsNone(getter.get(carrier, "missing-key"))
+
     def test_keys_empty_carrier(self):
         getter = ASGIGetter()
         keys = getter.keys({})
@@ -14,10 +14,11 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from os import environ
 from re import IGNORECASE as RE_IGNORECASE
+from re import Pattern
 from re import compile as re_compile
-from re import search
 from typing import Callable, Iterable, Optional
 from urllib.parse import urlparse, urlunparse
 
@@ -67,7 +68,11 @@ class ExcludeList:
             self._regex = re_compile("|".join(excluded_urls))
 
     def url_disabled(self, url: str) -> bool:
-        return bool(self._excluded_urls and search(self._regex, url))
+        return bool(self._excluded_urls and self._regex.search(url))
+
+
+# Value reported in place of sanitized header values
+_REDACTED_HEADER_VALUE = "[REDACTED]"
 
 
 class SanitizeValue:
@@ -80,43 +85,62 @@ class SanitizeValue:
 
     def sanitize_header_value(self, header: str, value: str) -> str:
         return (
-            "[REDACTED]"
-            if (self._sanitized_fields and search(self._regex, header))
+            _REDACTED_HEADER_VALUE
+            if (self._sanitized_fields and self._regex.search(header))
             else value
         )
 
     def sanitize_header_values(
         self,
         headers: dict[str, str],
-        header_regexes: list[str],
+        header_regexes: list[str] | Pattern[str] | None,
         normalize_function: Callable[[str], str],
     ) -> dict[str, str]:
         values: dict[str, str] = {}
 
         if header_regexes:
-            header_regexes_compiled = re_compile(
-                "|".join("^" + i + "$" for i in header_regexes),
-                RE_IGNORECASE,
+            if not isinstance(header_regexes, Pattern):
+                header_regexes = _compile_header_regexes(header_regexes)
+
+            # Resolve everything needed per header once, this loop runs for
+            # every captured header of every request.
+            match_header = (
+                None
+                if header_regexes.pattern == _CAPTURE_ALL_HEADERS_PATTERN
+                else header_regexes.match
             )
+            sanitize_header_value = self.sanitize_header_value
 
-            for header_name in list(
-                filter(
-                    header_regexes_compiled.match,
-                    headers.keys(),
-                )
-            ):
-                header_values = headers.get(header_name)
-                if header_values:
-                    key = normalize_function(header_name.lower())
-                    values[key] = [
-                        self.sanitize_header_value(
-                            header=header_name, value=header_values
-                        )
-                    ]
+            for header_name, header_values in headers.items():
+                if not header_values or (
+                    match_header is not None and not match_header(header_name)
+                ):
+                    continue
+                values[normalize_function(header_name.lower())] = [
+                    sanitize_header_value(header_name, header_values)
+                ]
 
         return values
 
 
+# What _compile_header_regexes returns for the capture all ".*" configuration,
+# which matches any header name, so there is no need to match them one by one
+_CAPTURE_ALL_HEADERS_PATTERN = "^.*$"
+
+
+def _compile_header_regexes(
+    header_regexes: Iterable[str],
+) -> Optional[Pattern[str]]:
+    """Compiles header name regexes into a single anchored, case insensitive
+    pattern that can be reused across calls to sanitize_header_values."""
+    if not header_regexes:
+        return None
+    return re_compile(
+        "|".join("^" + i + "$" for i in header_regexes),
+        RE_IGNORECASE,
+    )
+
+
 _root = r"OTEL_PYTHON_{}"
 
 
@@ -186,11 +210,15 @@ def remove_url_credentials(url: str) -> str:
     return url
 
 
+# The set of captured header names is small and repeats for every request, so
+# the normalised attribute names are cached.
+@lru_cache(maxsize=256)
 def normalise_request_header_name(header: str) -> str:
     key = header.lower().replace("-", "_")
     return f"http.request.header.{key}"
 
 
+@lru_cache(maxsize=256)
 def normalise_response_header_name(header: str) -> str:
     key = header.lower().replace("-", "_")
     return f"http.response.header.{key}"
@@ -231,17 +259,19 @@ def get_custom_headers(env_var: str) -> list[str]:
     return []
 
 
+# The recommended attribute sets are smaller than the request attributes, so
+# iterating them avoids building an intersection set for every request.
 def _parse_active_request_count_attrs(req_attrs):
     active_requests_count_attrs = {
         key: req_attrs[key]
-        for key in _active_requests_count_attrs.intersection(req_attrs.keys())
+        for key in _active_requests_count_attrs
+        if key in req_attrs
     }
     return active_requests_count_attrs
 
 
 def _parse_duration_attrs(req_attrs):
     duration_attrs = {
-        key: req_attrs[key]
-        for key in _duration_attrs.intersection(req_attrs.keys())
+        key: req_attrs[key] for key in _duration_attrs if key in req_attrs
     }
     return duration_attrs
@@ -20,6 +20,7 @@ from opentelemetry.util.http import (
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SERVER_REQUEST,
     OTEL_INSTRUMENTATION_HTTP_CAPTURE_HEADERS_SERVER_RESPONSE,
     SanitizeValue,
+    _compile_header_regexes,
     get_custom_headers,
     normalise_request_header_name,
     normalise_response_header_name,
@@ -102,6 +103,74 @@ class TestCaptureCustomHeaders(unittest.TestCase):
             "My-Not-Secret-Value",
         )
 
+    def test_sanitize_header_values_compiled_regexes(self):
+        sanitize = SanitizeValue(["my-secret-header"])
+        headers = {
+            "test-header": "test-value",
+            "my-secret-header": "my-secret-value",
+            "other-header": "other-value",
+        }
+        header_regexes = ["Test-Header", "my-.*"]
+
+        self.assertIsNone(_compile_header_regexes([]))
+        self.assertEqual(
+            sanitize.sanitize_header_values(
+                headers,
+                _compile_header_regexes(header_regexes),
+                normalise_request_header_name,
+            ),
+            sanitize.sanitize_header_values(
+                headers, header_regexes, normalise_request_header_name
+            ),
+        )
+        self.assertEqual(
+            sanitize.sanitize_header_values(
+                headers,
+                _compile_header_regexes(header_regexes),
+                normalise_request_header_name,
+            ),
+            {
+                "http.request.header.test_header": ["test-value"],
+                "http.request.header.my_secret_header": ["[REDACTED]"],
+            },
+        )
+
+    def test_sanitize_header_values_capture_all(self):
+        sanitize = SanitizeValue(["my-secret-header"])
+        headers = {
+            "Test-Header": "test-value",
+            "my-secret-header": "my-secret-value",
+        }
+
+        self.assertEqual(
+            sanitize.sanitize_header_values(
+                headers,
+                _compile_header_regexes([".*"]),
+                normalise_response_header_name,
+            ),
+            {
+                "http.response.header.test_header": ["test-value"],
+                "http.response.header.my_secret_header": ["[REDACTED]"],
+            },
+        )
+
+    def test_sanitize_header_values_uses_sanitize_header_value(self):
+        class UpperSanitizeValue(SanitizeValue):
+            def sanitize_header_value(self, header: str, value: str) -> str:
+                return value.upper()
+
+        sanitize = UpperSanitizeValue([])
+        headers = {"Test-Header": "test-value"}
+
+        self.assertEqual(
+            sanitize.sanitize_header_values(
+                headers,
+                _compile_header_regexes([".*"]),
+                normalise_response_header_name,
+            ),
+            {"http.response.header.test_header": ["TEST-VALUE"]},
+        )
+
     def test_normalise_request_header_name(self):
         key = normalise_request_header_name("Test-Header")
         self.assertEqual(key, "http.request.header.test_header")